@@ -2,6 +2,23 @@ import { EnhancedBaseAgent } from './enhanced-base-agent';
 import { AssessmentResponse, AgentContext, UserInput } from '../types/index';
 import { agentSystemMessages } from '../config/index';
 
+// Keyword tables hoisted to module scope so they are allocated once instead
+// of on every call
+const KNOWN_EMOTIONS = [
+  'anxiety', 'depression', 'anger', 'fear', 'sadness', 'happiness',
+  'joy', 'excitement', 'worry', 'stress', 'calm', 'peaceful',
+  'overwhelmed', 'hopeless', 'hopeful', 'confused', 'clear',
+  'frustrated', 'satisfied', 'lonely', 'connected'
+];
+
+const HIGH_RISK_INDICATORS = [
+  'suicide', 'self-harm', 'kill myself', 'end it all',
+  'hopeless', 'worthless', 'better off dead'
+];
+
+const HIGH_INTENSITY_SYMPTOMS = ['anxiety', 'depression', 'mood swings'];
+const MEDIUM_INTENSITY_SYMPTOMS = ['fatigue', 'insomnia', 'difficulty concentrating'];
+
 export class AssessmentAgent extends EnhancedBaseAgent {
   constructor() {
     super(
@@ -81,12 +98,8 @@ export class AssessmentAgent extends EnhancedBaseAgent {
    */
   private determineInitialRiskLevel(input: UserInput): string {
     const content = input.mentalState.toLowerCase();
-    const riskIndicators = [
-      'suicide', 'self-harm', 'kill myself', 'end it all',
-      'hopeless', 'worthless', 'better off dead'
-    ];
-    
-    if (riskIndicators.some(indicator => content.includes(indicator))) {
+
+    if (HIGH_RISK_INDICATORS.some(indicator => content.includes(indicator))) {
       return 'high';
     }
     if (input.stressLevel >= 8 || input.sleepPattern <= 4) {
@@ -164,17 +177,10 @@ export class AssessmentAgent extends EnhancedBaseAgent {
   }
 
   private extractEmotions(content: string): string[] {
-    const emotions = [
-      'anxiety', 'depression', 'anger', 'fear', 'sadness', 'happiness', 
-      'joy', 'excitement', 'worry', 'stress', 'calm', 'peaceful',
-      'overwhelmed', 'hopeless', 'hopeful', 'confused', 'clear',
-      'frustrated', 'satisfied', 'lonely', 'connected'
-    ];
-
     const foundEmotions: string[] = [];
     const lowerContent = content.toLowerCase();
 
-    for (const emotion of emotions) {
+    for (const emotion of KNOWN_EMOTIONS) {
       if (lowerContent.includes(emotion)) {
         foundEmotions.push(emotion);
       }
@@ -188,15 +194,12 @@ export class AssessmentAgent extends EnhancedBaseAgent {
     let intensity = input.stressLevel;
 
     // Adjust based on symptoms
-    const highIntensitySymptoms = ['anxiety', 'depression', 'mood swings'];
-    const mediumIntensitySymptoms = ['fatigue', 'insomnia', 'difficulty concentrating'];
-    
-    const highIntensityCount = input.currentSymptoms.filter(s => 
-      highIntensitySymptoms.includes(s.toLowerCase())
+    const highIntensityCount = input.currentSymptoms.filter(s =>
+      HIGH_INTENSITY_SYMPTOMS.includes(s.toLowerCase())
     ).length;
-    
-    const mediumIntensityCount = input.currentSymptoms.filter(s => 
-      mediumIntensitySymptoms.includes(s.toLowerCase())
+
+    const mediumIntensityCount = input.currentSymptoms.filter(s =>
+      MEDIUM_INTENSITY_SYMPTOMS.includes(s.toLowerCase())
     ).length;
 
     intensity += highIntensityCount * 1.5;
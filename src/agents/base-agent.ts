@@ -1,6 +1,12 @@
 import { Agent, AgentContext, AgentResponse, UserInput } from '../types/index';
 import { openAIService } from '../services/openai.service';
+import { config } from '../config/index';
 import { createLogger } from '../utils/logger';
+import { formatUserInputMessage } from '../utils/prompt';
+
+// Precompiled at module scope: these run once per response line
+const LIST_MARKER_RE = /^(?:[-•*]|\d+\.)\s/;
+const SENTENCE_SPLIT_RE = /[.!?]+/;
 
 export abstract class BaseAgent implements Agent {
   public readonly name: string;
@@ -30,11 +36,23 @@ export abstract class BaseAgent implements Agent {
     const startTime = Date.now();
     
     try {
-      const response = await openAIService.generateResponse(
-        this.systemMessage,
-        userMessage,
-        context ? this.formatContext(context) : undefined
-      );
+      // Streaming returns the same final string but starts receiving tokens
+      // as soon as the model emits them, improving time-to-first-token
+      const response = config.streamingEnabled
+        ? await openAIService.generateStreamingResponse(
+            this.systemMessage,
+            userMessage,
+            context ? this.formatContext(context) : undefined,
+            undefined,
+            context?.signal
+          )
+        : await openAIService.generateResponse(
+            this.systemMessage,
+            userMessage,
+            context ? this.formatContext(context) : undefined,
+            undefined,
+            context?.signal
+          );
 
       const duration = Date.now() - startTime;
       this.logger.info('AI response generated successfully', {
@@ -56,14 +74,7 @@ export abstract class BaseAgent implements Agent {
   }
 
   protected formatUserMessage(userInput: UserInput, context?: AgentContext): string {
-    let message = `Please analyze the following user information and provide a response:
-
-Mental State: ${userInput.mentalState}
-Sleep Pattern: ${userInput.sleepPattern} hours per night
-Stress Level: ${userInput.stressLevel}/10
-Support System: ${userInput.supportSystem.join(', ') || 'None reported'}
-Recent Changes: ${userInput.recentChanges || 'None reported'}
-Current Symptoms: ${userInput.currentSymptoms.join(', ') || 'None reported'}`;
+    let message = formatUserInputMessage(userInput);
 
     if (context?.previousResponses && context.previousResponses.length > 0) {
       message += '\n\nPrevious agent responses for context:';
@@ -106,8 +117,12 @@ ${context.previousResponses.map((response, index) =>
     const lines = content.split('\n');
     for (const line of lines) {
       const trimmed = line.trim();
-      if (trimmed.match(/^[-•*]\s/) || trimmed.match(/^\d+\.\s/)) {
-        const recommendation = trimmed.replace(/^[-•*]\s/, '').replace(/^\d+\.\s/, '');
+      if (LIST_MARKER_RE.test(trimmed)) {
+        // Strip stacked markers ("- 1. item") too, not just the outermost one
+        let recommendation = trimmed;
+        while (LIST_MARKER_RE.test(recommendation)) {
+          recommendation = recommendation.replace(LIST_MARKER_RE, '');
+        }
         if (recommendation.length > 10) {
           recommendations.push(recommendation);
         }
@@ -116,7 +131,7 @@ ${context.previousResponses.map((response, index) =>
 
     // If no structured recommendations found, extract sentences that might be recommendations
     if (recommendations.length === 0) {
-      const sentences = content.split(/[.!?]+/).filter(s => s.trim().length > 20);
+      const sentences = content.split(SENTENCE_SPLIT_RE).filter(s => s.trim().length > 20);
       recommendations.push(...sentences.slice(0, 3).map(s => s.trim()));
     }
 
@@ -3,6 +3,7 @@ import { BaseAgent } from './base-agent';
 import { ragFoundationService } from '../services/rag/rag-foundation.service';
 import { DomainAdapterFactory } from '../services/rag/domain-adapter.service';
 import { featureFlagService } from '../services/feature-flag.service';
+import { config } from '../config/index';
 import { createLogger } from '../utils/logger';
 
 /**
@@ -598,11 +599,25 @@ export abstract class EnhancedBaseAgent extends BaseAgent {
     // This would use the same OpenAI service but with custom messages
     // For now, we'll use the existing service with enhanced context
     const { openAIService } = require('../services/openai.service');
-    
+
+    // Same streaming toggle as BaseAgent.generateAIResponse: the RAG path
+    // should benefit from early tokens too when the flag is on
+    if (config.streamingEnabled) {
+      return await openAIService.generateStreamingResponse(
+        systemMessage,
+        userMessage,
+        context ? this.formatContext(context) : undefined,
+        undefined,
+        context?.signal
+      );
+    }
+
     return await openAIService.generateResponse(
       systemMessage,
       userMessage,
-      context ? this.formatContext(context) : undefined
+      context ? this.formatContext(context) : undefined,
+      undefined,
+      context?.signal
     );
   }
 
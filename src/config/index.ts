@@ -14,7 +14,19 @@ const EnvironmentSchema = z.object({
   OPENAI_TEMPERATURE: z.string().transform(Number).default('0.7'),
   OPENAI_MAX_TOKENS: z.string().transform(Number).default('2000'),
   OPENAI_TIMEOUT: z.string().transform(Number).default('30000'),
+  OPENAI_MAX_CONNECTIONS: z.string().transform(Number).default('32'),
+  OPENAI_STREAMING: z.string().transform(val => val === 'true').default('false'),
   LOG_LEVEL: z.enum(['error', 'warn', 'info', 'debug']).default('info'),
+  // Number of redundant agent teams raced per plan (first successful wins)
+  PARALLEL_TEAMS: z.string().transform(Number).default('1'),
+  // Collapse the three agent prompts into a single batched LLM call
+  SINGLE_CALL_PLAN: z.string().transform(val => val === 'true').default('false'),
+  // Run all parallel teams to completion and judge the best result instead
+  // of keeping the first to finish
+  PLAN_AGGREGATION: z.string().transform(val => val === 'true').default('false'),
+  OPENAI_JUDGE_MODEL: z.string().default('gpt-4o-mini'),
+  // Directory where the plan cache is persisted across restarts
+  PLAN_CACHE_DIR: z.string().default('.cache'),
   CORS_ORIGIN: z.string().default('*'),
   // Supabase configuration
   SUPABASE_URL: z.string().optional(),
@@ -38,6 +50,8 @@ export const config: SystemConfig = {
   temperature: env.OPENAI_TEMPERATURE,
   maxTokens: env.OPENAI_MAX_TOKENS,
   timeout: env.OPENAI_TIMEOUT,
+  maxConnections: env.OPENAI_MAX_CONNECTIONS,
+  streamingEnabled: env.OPENAI_STREAMING,
 };
 
 // Server configuration
@@ -60,6 +74,16 @@ export const supabaseConfig = {
   serviceKey: env.SUPABASE_SERVICE_KEY,
 };
 
+// Planner configuration
+export const plannerConfig = {
+  // Clamp to a sane fan-out: each extra team costs a full set of LLM calls
+  parallelTeams: Math.min(Math.max(env.PARALLEL_TEAMS, 1), 4),
+  singleCall: env.SINGLE_CALL_PLAN,
+  aggregate: env.PLAN_AGGREGATION,
+  judgeModel: env.OPENAI_JUDGE_MODEL,
+  cacheDir: env.PLAN_CACHE_DIR,
+};
+
 // RAG configuration
 export const ragConfig = {
   enabled: env.RAG_ENABLED,
@@ -153,6 +177,74 @@ Provide your response in JSON format with the following structure:
 }`
 };
 
+// Combined prompt for single-call plan generation: the three agent roles are
+// answered in one request instead of three round trips over the same input
+export const singleCallSystemMessage = `You are a team of three mental health specialists answering together in a single pass:
+
+### Assessment
+An experienced mental health professional who analyzes emotional state with clinical precision and empathy, identifies patterns, and assesses risk levels with validated screening approaches.
+
+### Action
+A crisis intervention and resource specialist who provides immediate evidence-based coping strategies, connects with appropriate services, and creates concrete daily wellness plans.
+
+### Follow-up
+A mental health recovery planner who designs personalized long-term support strategies, progress monitoring systems, and relapse prevention strategies.
+
+Always use "you" and "your" when addressing the user. Blend clinical expertise with genuine warmth.
+Provide your response in JSON format with the following structure:
+{
+  "assessment": {
+    "content": "Your detailed analysis",
+    "recommendations": ["rec1", "rec2"],
+    "emotionalAnalysis": {
+      "primaryEmotions": ["emotion1", "emotion2"],
+      "intensity": 7,
+      "patterns": ["pattern1", "pattern2"]
+    },
+    "riskFactors": ["risk1", "risk2"],
+    "protectiveFactors": ["protective1", "protective2"],
+    "riskLevel": "low|medium|high"
+  },
+  "action": {
+    "content": "Your detailed action plan",
+    "recommendations": ["rec1", "rec2"],
+    "immediateActions": [
+      {
+        "title": "Action title",
+        "description": "Action description",
+        "priority": "high|medium|low",
+        "estimatedTime": "5 minutes"
+      }
+    ],
+    "resources": [
+      {
+        "type": "hotline|app|website|community",
+        "name": "Resource name",
+        "description": "Resource description",
+        "url": "https://example.com",
+        "phone": "1-800-123-4567"
+      }
+    ],
+    "urgency": "low|medium|high"
+  },
+  "followUp": {
+    "content": "Your detailed follow-up strategy",
+    "recommendations": ["rec1", "rec2"],
+    "longTermStrategies": [
+      {
+        "category": "Strategy category",
+        "strategies": ["strategy1", "strategy2"],
+        "timeline": "3-6 months"
+      }
+    ],
+    "monitoringPlan": {
+      "frequency": "weekly",
+      "metrics": ["metric1", "metric2"],
+      "checkInQuestions": ["question1", "question2"]
+    }
+  }
+}`;
+
 // Crisis resources
 export const crisisResources = {
   hotlines: [
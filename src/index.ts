@@ -183,6 +183,95 @@ app.post('/api/mental-health-plan', async (req: express.Request, res: express.Re
   }
 });
 
+// Deferred plan generation via the OpenAI Batch API (~50% cheaper, <=24h)
+app.post('/api/mental-health-plan/batch', async (req: express.Request, res: express.Response) => {
+  const sessionId = crypto.randomUUID();
+
+  try {
+    const userInput: UserInput = req.body;
+
+    if (!userInput || Object.keys(userInput).length === 0) {
+      throw new ValidationError('Request body is required', 'body', req.body);
+    }
+
+    try {
+      UserInputSchema.parse(userInput);
+    } catch (validationError) {
+      if (validationError instanceof Error) {
+        throw new ValidationError(
+          `Validation failed: ${validationError.message}`,
+          'body',
+          userInput
+        );
+      }
+      throw new ValidationError('Invalid request body structure', 'body', userInput);
+    }
+
+    const batchId = await agentCoordinator.submitPlanBatch(userInput, sessionId);
+
+    logger.info('Mental health plan batch submitted', { sessionId, batchId });
+
+    const response: ApiResponse<{ batchId: string; sessionId: string }> = {
+      success: true,
+      data: { batchId, sessionId },
+      timestamp: new Date(),
+    };
+
+    res.json(response);
+  } catch (error) {
+    logger.error('Failed to submit mental health plan batch', {
+      sessionId,
+      error: error instanceof Error ? error.message : 'Unknown error',
+    });
+
+    const statusCode = error instanceof ValidationError ? 400 : error instanceof AgentError ? 422 : 500;
+
+    res.status(statusCode).json({
+      success: false,
+      error: {
+        message: error instanceof Error ? error.message : 'Internal server error',
+        code: error instanceof ValidationError ? 'VALIDATION_ERROR'
+          : error instanceof AgentError ? (error.code || 'INTERNAL_ERROR')
+          : 'INTERNAL_ERROR',
+      },
+      timestamp: new Date(),
+    });
+  }
+});
+
+// Poll a submitted batch; parsed agent responses are included once completed
+app.get('/api/mental-health-plan/batch/:batchId', async (req: express.Request, res: express.Response) => {
+  const { batchId } = req.params;
+
+  try {
+    const result = await agentCoordinator.getPlanBatchResults(batchId);
+
+    const response: ApiResponse<typeof result> = {
+      success: true,
+      data: result,
+      timestamp: new Date(),
+    };
+
+    res.json(response);
+  } catch (error) {
+    logger.error('Failed to retrieve mental health plan batch', {
+      batchId,
+      error: error instanceof Error ? error.message : 'Unknown error',
+    });
+
+    const statusCode = error instanceof AgentError ? 422 : 500;
+
+    res.status(statusCode).json({
+      success: false,
+      error: {
+        message: error instanceof Error ? error.message : 'Internal server error',
+        code: error instanceof AgentError ? (error.code || 'INTERNAL_ERROR') : 'INTERNAL_ERROR',
+      },
+      timestamp: new Date(),
+    });
+  }
+});
+
 // Error handling middleware
 app.use((error: Error, req: express.Request, res: express.Response, _next: express.NextFunction) => {
   logger.error('Unhandled error', {
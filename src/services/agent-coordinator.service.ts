@@ -13,17 +13,46 @@ import { createLogger } from '../utils/logger';
 import { UserInputSchema } from '../types/index';
 import { ragFoundationService } from './rag/rag-foundation.service';
 import { featureFlagService } from './feature-flag.service';
+import { config, plannerConfig, serverConfig, singleCallSystemMessage } from '../config/index';
+import { openAIService } from './openai.service';
+import { createHash } from 'crypto';
+import * as fs from 'fs';
+import * as path from 'path';
+import { formatUserInputMessage } from '../utils/prompt';
+
+interface AgentTeamResult {
+  assessment: AssessmentResponse;
+  actionPlan: ActionResponse;
+  followUp: FollowUpResponse;
+}
+
+// Identical submissions within the TTL are served from cache instead of
+// re-running the full set of LLM calls. The cache is written through to disk
+// so common entries survive process restarts.
+const PLAN_CACHE_TTL_MS = 24 * 60 * 60 * 1000; // 24 hours
+const PLAN_CACHE_MAX_ENTRIES = 256;
+const PLAN_CACHE_FILE = path.join(plannerConfig.cacheDir, 'plan-cache.json');
+// Disk persistence is disabled under test so unit runs stay hermetic and
+// don't leak cache files into the working tree
+const PLAN_CACHE_PERSIST = serverConfig.nodeEnv !== 'test';
+
+// The single-call response carries all three agent sections in one JSON
+// body, so it needs roughly three agents' worth of completion budget; the
+// per-agent limit would truncate the JSON and fail the whole plan
+const SINGLE_CALL_MAX_TOKENS = config.maxTokens * 3;
 
 export class AgentCoordinatorService {
   private readonly assessmentAgent: AssessmentAgent;
   private readonly actionAgent: ActionAgent;
   private readonly followUpAgent: FollowUpAgent;
   private readonly logger = createLogger('AgentCoordinator');
+  private readonly planCache = new Map<string, { plan: MentalHealthPlan; expiresAt: number }>();
 
   constructor() {
     this.assessmentAgent = new AssessmentAgent();
     this.actionAgent = new ActionAgent();
     this.followUpAgent = new FollowUpAgent();
+    this.loadPlanCacheFromDisk();
   }
 
   async generateMentalHealthPlan(
@@ -40,55 +69,51 @@ export class AgentCoordinatorService {
       // Validate user input
       const validatedInput = UserInputSchema.parse(userInput);
 
+      // Serve identical submissions from cache instead of re-running the agents
+      const cacheKey = this.buildPlanCacheKey(validatedInput);
+      const cached = this.getCachedPlan(cacheKey);
+      if (cached) {
+        this.logger.info('Serving mental health plan from cache', { sessionId, cacheKey });
+        return { ...cached, sessionId };
+      }
+
       // Check RAG system status for enhanced context
       const ragStatus = await this.checkRAGStatus();
-      
-      // Step 1: Assessment with RAG enhancement
-      this.logger.info('Starting RAG-enhanced assessment phase', { sessionId, ragStatus });
-      const assessment = await this.assessmentAgent.process(validatedInput, {
-        sessionId,
-        userInput: validatedInput,
-        ragContext: {
-          domain: 'life_coaching',
-          domainId: 'life_coaching',
-          relevantDocuments: [],
-          searchQuery: validatedInput.mentalState,
-          sessionHistory: [],
-          // userPreferences: this.extractUserPreferences(validatedInput),
-        }
-      });
 
-      // Step 2: Action Plan with context from assessment
-      this.logger.info('Starting RAG-enhanced action plan phase', { sessionId });
-      const actionPlan = await this.actionAgent.process(validatedInput, {
-        sessionId,
-        userInput: validatedInput,
-        previousResponses: [assessment],
-        ragContext: {
-          domain: 'life_coaching',
-          domainId: 'life_coaching',
-          relevantDocuments: [],
-          searchQuery: validatedInput.mentalState,
-          assessmentInsights: this.extractAssessmentInsights(assessment),
-          // urgencyLevel: assessment.riskLevel,
+      // Optionally race redundant agent teams and keep the first one to finish,
+      // trading extra LLM calls for lower tail latency.
+      const teams = plannerConfig.parallelTeams;
+      // Single-call mode swaps the team implementation, not the fan-out:
+      // racing and aggregation compose with it the same way they do with
+      // the full three-agent teams
+      const runTeam = (team: number, signal?: AbortSignal): Promise<AgentTeamResult> =>
+        plannerConfig.singleCall
+          ? this.runSingleCallTeam(validatedInput, sessionId, signal)
+          : this.runAgentTeam(validatedInput, sessionId, ragStatus, team, signal);
+
+      let teamResult: AgentTeamResult;
+      if (teams > 1 && plannerConfig.aggregate) {
+        teamResult = await this.runAggregatedTeams(sessionId, teams, runTeam);
+      } else if (teams > 1) {
+        this.logger.info('Racing redundant agent teams', { sessionId, teams });
+        // Each team gets its own abort controller so the losers' in-flight
+        // LLM calls are cancelled once a winner resolves, instead of running
+        // to completion and billing tokens for discarded results
+        const controllers = Array.from({ length: teams }, () => new AbortController());
+        try {
+          teamResult = await Promise.any(
+            controllers.map((controller, team) => runTeam(team, controller.signal))
+          );
+        } catch (error) {
+          // Promise.any rejects with AggregateError when every team failed
+          throw error instanceof AggregateError ? error.errors[0] : error;
+        } finally {
+          controllers.forEach(controller => controller.abort());
         }
-      });
-
-      // Step 3: Follow-up Strategy with comprehensive context
-      this.logger.info('Starting RAG-enhanced follow-up strategy phase', { sessionId });
-      const followUp = await this.followUpAgent.process(validatedInput, {
-        sessionId,
-        userInput: validatedInput,
-        previousResponses: [assessment, actionPlan],
-        ragContext: {
-          domain: 'life_coaching',
-          domainId: 'life_coaching',
-          relevantDocuments: [],
-          searchQuery: validatedInput.mentalState,
-          recoveryStage: this.determineRecoveryStage(assessment, actionPlan),
-          // planningTimeframe: actionPlan.urgency === 'high' ? 'short_term' : 'medium_term',
-        }
-      });
+      } else {
+        teamResult = await runTeam(0);
+      }
+      const { assessment, actionPlan, followUp } = teamResult;
 
       // Generate enhanced summary with RAG insights
       const summary = this.generateEnhancedSummary(assessment, actionPlan, followUp, ragStatus);
@@ -122,6 +147,8 @@ export class AgentCoordinatorService {
         ragQuality: ragStatus.ready ? 'high' : 'degraded'
       });
 
+      this.storeCachedPlan(cacheKey, mentalHealthPlan);
+
       return mentalHealthPlan;
     } catch (error) {
       this.logger.error('Failed to generate mental health plan', {
@@ -142,6 +169,380 @@ export class AgentCoordinatorService {
     }
   }
 
+  /**
+   * Build a cache key from the validated input only - session ids and
+   * credentials never participate in the key
+   */
+  private buildPlanCacheKey(input: UserInput): string {
+    const canonical = JSON.stringify({
+      mentalState: input.mentalState,
+      sleepPattern: input.sleepPattern,
+      stressLevel: input.stressLevel,
+      supportSystem: input.supportSystem,
+      recentChanges: input.recentChanges || '',
+      currentSymptoms: input.currentSymptoms,
+    });
+    return createHash('sha256').update(canonical).digest('hex');
+  }
+
+  /**
+   * Look up a cached plan, dropping it if expired
+   */
+  private getCachedPlan(cacheKey: string): MentalHealthPlan | undefined {
+    const entry = this.planCache.get(cacheKey);
+    if (!entry) {
+      return undefined;
+    }
+    if (Date.now() > entry.expiresAt) {
+      this.planCache.delete(cacheKey);
+      return undefined;
+    }
+    // Hand out a deep copy so callers mutating their plan cannot poison
+    // later cache hits
+    return structuredClone(entry.plan);
+  }
+
+  /**
+   * Store a plan, evicting the oldest entry when the cache is full
+   */
+  private storeCachedPlan(cacheKey: string, plan: MentalHealthPlan): void {
+    if (this.planCache.size >= PLAN_CACHE_MAX_ENTRIES) {
+      const oldestKey = this.planCache.keys().next().value;
+      if (oldestKey !== undefined) {
+        this.planCache.delete(oldestKey);
+      }
+    }
+    this.planCache.set(cacheKey, {
+      plan: structuredClone(plan),
+      expiresAt: Date.now() + PLAN_CACHE_TTL_MS,
+    });
+    this.persistPlanCacheToDisk();
+  }
+
+  /**
+   * Restore unexpired cache entries from disk at startup
+   */
+  private loadPlanCacheFromDisk(): void {
+    if (!PLAN_CACHE_PERSIST) {
+      return;
+    }
+    try {
+      if (!fs.existsSync(PLAN_CACHE_FILE)) {
+        return;
+      }
+      const entries: [string, { plan: MentalHealthPlan; expiresAt: number }][] =
+        JSON.parse(fs.readFileSync(PLAN_CACHE_FILE, 'utf-8'));
+      const now = Date.now();
+      for (const [key, entry] of entries) {
+        if (entry.expiresAt > now) {
+          // JSON.parse leaves the agent timestamps as strings; restore them
+          // so cached plans look identical to freshly generated ones
+          this.planCache.set(key, { ...entry, plan: this.rehydratePlan(entry.plan) });
+        }
+      }
+      this.logger.info('Plan cache restored from disk', { entries: this.planCache.size });
+    } catch (error) {
+      this.logger.warn('Failed to load plan cache from disk', {
+        error: error instanceof Error ? error.message : 'Unknown error',
+      });
+    }
+  }
+
+  /**
+   * Write the cache through to disk; failures only cost persistence, never
+   * the request
+   */
+  private persistPlanCacheToDisk(): void {
+    if (!PLAN_CACHE_PERSIST) {
+      return;
+    }
+    const snapshot = JSON.stringify([...this.planCache.entries()]);
+    fs.promises
+      .mkdir(plannerConfig.cacheDir, { recursive: true })
+      .then(() => fs.promises.writeFile(PLAN_CACHE_FILE, snapshot, 'utf-8'))
+      .catch(error => {
+        this.logger.warn('Failed to persist plan cache to disk', {
+          error: error instanceof Error ? error.message : 'Unknown error',
+        });
+      });
+  }
+
+  /**
+   * Convert the serialized timestamp strings of a restored plan back to Dates
+   */
+  private rehydratePlan(plan: MentalHealthPlan): MentalHealthPlan {
+    return {
+      ...plan,
+      assessment: { ...plan.assessment, timestamp: new Date(plan.assessment.timestamp) },
+      actionPlan: { ...plan.actionPlan, timestamp: new Date(plan.actionPlan.timestamp) },
+      followUp: { ...plan.followUp, timestamp: new Date(plan.followUp.timestamp) },
+    };
+  }
+
+  /**
+   * Format the questionnaire the same way the agents present it to the model
+   */
+  private buildUserMessage(input: UserInput): string {
+    return formatUserInputMessage(input);
+  }
+
+  /**
+   * Submit the three agent prompts as an OpenAI batch job for deferred,
+   * cheaper processing. Returns the batch id for later polling.
+   */
+  async submitPlanBatch(userInput: UserInput, sessionId: string): Promise<string> {
+    const validatedInput = UserInputSchema.parse(userInput);
+    const userMessage = this.buildUserMessage(validatedInput);
+
+    this.logger.info('Submitting mental health plan as batch job', { sessionId });
+
+    return openAIService.submitBatch([
+      {
+        customId: 'assessment',
+        systemMessage: this.assessmentAgent.systemMessage,
+        userMessage,
+      },
+      {
+        customId: 'action',
+        systemMessage: this.actionAgent.systemMessage,
+        userMessage,
+      },
+      {
+        customId: 'followUp',
+        systemMessage: this.followUpAgent.systemMessage,
+        userMessage,
+      },
+    ]);
+  }
+
+  /**
+   * Poll a plan batch job; parsed agent responses are included once completed
+   */
+  async getPlanBatchResults(batchId: string): Promise<{
+    status: string;
+    responses?: Record<string, any>;
+  }> {
+    const { status, results } = await openAIService.getBatchResults(batchId);
+
+    if (!results) {
+      return { status };
+    }
+
+    const responses: Record<string, any> = {};
+    for (const [section, content] of Object.entries(results)) {
+      responses[section] = await openAIService.parseJsonResponse(content);
+    }
+
+    return { status, responses };
+  }
+
+  /**
+   * Generate all three sections with a single batched LLM call. The shared
+   * user input is sent once instead of three times, at the cost of the agents
+   * not seeing each other's output.
+   */
+  private async runSingleCallTeam(
+    validatedInput: UserInput,
+    sessionId: string,
+    signal?: AbortSignal
+  ): Promise<AgentTeamResult> {
+    this.logger.info('Generating plan with single batched LLM call', { sessionId });
+
+    const userMessage = this.buildUserMessage(validatedInput);
+    const response = await openAIService.generateResponse(
+      singleCallSystemMessage,
+      userMessage,
+      undefined,
+      undefined,
+      signal,
+      SINGLE_CALL_MAX_TOKENS
+    );
+    const parsed = await openAIService.parseJsonResponse(response);
+    const timestamp = new Date();
+
+    const assessment: AssessmentResponse = {
+      agentName: 'assessment_agent',
+      content: parsed.assessment?.content || '',
+      recommendations: parsed.assessment?.recommendations || [],
+      emotionalAnalysis: {
+        primaryEmotions: parsed.assessment?.emotionalAnalysis?.primaryEmotions || [],
+        intensity: parsed.assessment?.emotionalAnalysis?.intensity || validatedInput.stressLevel,
+        patterns: parsed.assessment?.emotionalAnalysis?.patterns || [],
+      },
+      riskFactors: parsed.assessment?.riskFactors || [],
+      protectiveFactors: parsed.assessment?.protectiveFactors || [],
+      riskLevel: parsed.assessment?.riskLevel || 'low',
+      timestamp,
+    };
+
+    const actionPlan: ActionResponse = {
+      agentName: 'action_agent',
+      content: parsed.action?.content || '',
+      recommendations: parsed.action?.recommendations || [],
+      immediateActions: parsed.action?.immediateActions || [],
+      resources: parsed.action?.resources || [],
+      urgency: parsed.action?.urgency || 'low',
+      timestamp,
+    };
+
+    const followUp: FollowUpResponse = {
+      agentName: 'followup_agent',
+      content: parsed.followUp?.content || '',
+      recommendations: parsed.followUp?.recommendations || [],
+      longTermStrategies: parsed.followUp?.longTermStrategies || [],
+      monitoringPlan: {
+        frequency: parsed.followUp?.monitoringPlan?.frequency || 'weekly',
+        metrics: parsed.followUp?.monitoringPlan?.metrics || [],
+        checkInQuestions: parsed.followUp?.monitoringPlan?.checkInQuestions || [],
+      },
+      timestamp,
+    };
+
+    return { assessment, actionPlan, followUp };
+  }
+
+  /**
+   * Enhanced mode: run every team to completion and let a cheap judge call
+   * pick the strongest candidate plan. Higher quality at full fan-out cost.
+   */
+  private async runAggregatedTeams(
+    sessionId: string,
+    teams: number,
+    runTeam: (team: number) => Promise<AgentTeamResult>
+  ): Promise<AgentTeamResult> {
+    this.logger.info('Running agent teams in aggregation mode', { sessionId, teams });
+
+    const settled = await Promise.allSettled(
+      Array.from({ length: teams }, (_, team) => runTeam(team))
+    );
+
+    const candidates = settled
+      .filter((result): result is PromiseFulfilledResult<AgentTeamResult> => result.status === 'fulfilled')
+      .map(result => result.value);
+
+    if (candidates.length === 0) {
+      throw (settled[0] as PromiseRejectedResult).reason;
+    }
+    if (candidates.length === 1) {
+      return candidates[0];
+    }
+
+    return this.judgeBestCandidate(candidates, sessionId);
+  }
+
+  /**
+   * Ask a cheap judge model which candidate plan is strongest; falls back to
+   * the first candidate if the verdict is unusable
+   */
+  private async judgeBestCandidate(
+    candidates: AgentTeamResult[],
+    sessionId: string
+  ): Promise<AgentTeamResult> {
+    try {
+      const judgeSystemMessage = `You are a senior mental health plan reviewer. You will receive several candidate plans for the same person, each with an assessment, an action plan, and a follow-up strategy. Pick the candidate that is the most specific, actionable, and appropriately matched to the described risk level.
+Provide your response in JSON format with the following structure:
+{
+  "best": 0,
+  "reason": "Short justification"
+}`;
+
+      const candidateSummaries = candidates
+        .map((candidate, index) =>
+          `Candidate ${index}:
+Assessment (risk ${candidate.assessment.riskLevel}): ${candidate.assessment.content.substring(0, 600)}
+Action plan (urgency ${candidate.actionPlan.urgency}): ${candidate.actionPlan.content.substring(0, 600)}
+Follow-up: ${candidate.followUp.content.substring(0, 600)}`
+        )
+        .join('\n\n');
+
+      const verdict = await openAIService.generateResponse(
+        judgeSystemMessage,
+        candidateSummaries,
+        undefined,
+        plannerConfig.judgeModel
+      );
+      const parsed = await openAIService.parseJsonResponse(verdict);
+      const best = Number(parsed.best);
+
+      if (Number.isInteger(best) && best >= 0 && best < candidates.length) {
+        this.logger.info('Judge selected candidate plan', { sessionId, best, reason: parsed.reason });
+        return candidates[best];
+      }
+
+      this.logger.warn('Judge verdict out of range, keeping first candidate', { sessionId, best });
+    } catch (error) {
+      this.logger.warn('Judge call failed, keeping first candidate', {
+        sessionId,
+        error: error instanceof Error ? error.message : 'Unknown error',
+      });
+    }
+
+    return candidates[0];
+  }
+
+  /**
+   * Run one assessment -> (action || follow-up) agent team
+   */
+  private async runAgentTeam(
+    validatedInput: UserInput,
+    sessionId: string,
+    ragStatus: { enabled: boolean; ready: boolean; quality: string },
+    team: number,
+    signal?: AbortSignal
+  ): Promise<AgentTeamResult> {
+    // Step 1: Assessment with RAG enhancement
+    this.logger.info('Starting RAG-enhanced assessment phase', { sessionId, team, ragStatus });
+    const assessment = await this.assessmentAgent.process(validatedInput, {
+      sessionId,
+      userInput: validatedInput,
+      signal,
+      ragContext: {
+        domain: 'life_coaching',
+        domainId: 'life_coaching',
+        relevantDocuments: [],
+        searchQuery: validatedInput.mentalState,
+        sessionHistory: [],
+        // userPreferences: this.extractUserPreferences(validatedInput),
+      }
+    });
+
+    // Steps 2 & 3: Action plan and follow-up strategy both depend only on the
+    // assessment, so run them concurrently to cut one full LLM round trip.
+    this.logger.info('Starting RAG-enhanced action plan and follow-up phases in parallel', { sessionId, team });
+    const [actionPlan, followUp] = await Promise.all([
+      this.actionAgent.process(validatedInput, {
+        sessionId,
+        userInput: validatedInput,
+        previousResponses: [assessment],
+        signal,
+        ragContext: {
+          domain: 'life_coaching',
+          domainId: 'life_coaching',
+          relevantDocuments: [],
+          searchQuery: validatedInput.mentalState,
+          assessmentInsights: this.extractAssessmentInsights(assessment),
+          // urgencyLevel: assessment.riskLevel,
+        }
+      }),
+      this.followUpAgent.process(validatedInput, {
+        sessionId,
+        userInput: validatedInput,
+        previousResponses: [assessment],
+        signal,
+        ragContext: {
+          domain: 'life_coaching',
+          domainId: 'life_coaching',
+          relevantDocuments: [],
+          searchQuery: validatedInput.mentalState,
+          recoveryStage: this.determineRecoveryStage(assessment),
+          // planningTimeframe: assessment.riskLevel === 'high' ? 'short_term' : 'medium_term',
+        }
+      }),
+    ]);
+
+    return { assessment, actionPlan, followUp };
+  }
+
   private generateSummary(
     assessment: AssessmentResponse,
     actionPlan: ActionResponse,
@@ -277,11 +678,11 @@ export class AgentCoordinatorService {
   /**
    * Determine recovery stage for follow-up planning
    */
-  private determineRecoveryStage(assessment: AssessmentResponse, actionPlan: ActionResponse): string {
-    if (assessment.riskLevel === 'high' || actionPlan.urgency === 'high') {
+  private determineRecoveryStage(assessment: AssessmentResponse): string {
+    if (assessment.riskLevel === 'high') {
       return 'crisis_stabilization';
     }
-    if (assessment.riskLevel === 'medium' || actionPlan.urgency === 'medium') {
+    if (assessment.riskLevel === 'medium') {
       return 'active_recovery';
     }
     return 'maintenance';
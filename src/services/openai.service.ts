@@ -1,50 +1,87 @@
-import OpenAI from 'openai';
+import https from 'https';
+import OpenAI, { toFile } from 'openai';
 import { config } from '../config/index';
 import { AgentError } from '../types/index';
 import { logger } from '../utils/logger';
 
-export class OpenAIService {
-  private client: OpenAI;
+// Shared keep-alive agent so concurrent agent calls reuse pooled TLS
+// connections instead of paying a handshake per request
+const httpAgent = new https.Agent({
+  keepAlive: true,
+  maxSockets: config.maxConnections,
+});
+
+// One client per API key: every OpenAIService instance with the same key
+// shares a single client (and its pooled sockets) instead of constructing
+// a fresh one. Keys are never logged; the cache is keyed on the raw value
+// only in memory.
+const clientCache = new Map<string, OpenAI>();
 
-  constructor() {
-    this.client = new OpenAI({
-      apiKey: config.openaiApiKey,
+function getClient(apiKey: string): OpenAI {
+  let client = clientCache.get(apiKey);
+  if (!client) {
+    client = new OpenAI({
+      apiKey,
       timeout: config.timeout,
+      httpAgent,
     });
+    clientCache.set(apiKey, client);
   }
+  return client;
+}
 
-  async generateResponse(
+export class OpenAIService {
+  private client: OpenAI;
+
+  constructor(apiKey: string = config.openaiApiKey) {
+    this.client = getClient(apiKey);
+  }
+
+  private buildMessages(
     systemMessage: string,
     userMessage: string,
     context?: string
+  ): OpenAI.Chat.Completions.ChatCompletionMessageParam[] {
+    const messages: OpenAI.Chat.Completions.ChatCompletionMessageParam[] = [
+      {
+        role: 'system',
+        content: systemMessage,
+      },
+    ];
+
+    if (context) {
+      messages.push({
+        role: 'user',
+        content: `Context: ${context}\n\nUser Input: ${userMessage}`,
+      });
+    } else {
+      messages.push({
+        role: 'user',
+        content: userMessage,
+      });
+    }
+
+    return messages;
+  }
+
+  async generateResponse(
+    systemMessage: string,
+    userMessage: string,
+    context?: string,
+    model: string = config.model,
+    signal?: AbortSignal,
+    maxTokens: number = config.maxTokens
   ): Promise<string> {
     try {
-      const messages: OpenAI.Chat.Completions.ChatCompletionMessageParam[] = [
-        {
-          role: 'system',
-          content: systemMessage,
-        },
-      ];
-
-      if (context) {
-        messages.push({
-          role: 'user',
-          content: `Context: ${context}\n\nUser Input: ${userMessage}`,
-        });
-      } else {
-        messages.push({
-          role: 'user',
-          content: userMessage,
-        });
-      }
+      const messages = this.buildMessages(systemMessage, userMessage, context);
 
       const completion = await this.client.chat.completions.create({
-        model: config.model,
+        model,
         messages,
         temperature: config.temperature,
-        max_tokens: config.maxTokens,
+        max_tokens: maxTokens,
         response_format: { type: "json_object" },
-      });
+      }, { signal });
 
       const response = completion.choices[0]?.message?.content;
       
@@ -57,7 +94,7 @@ export class OpenAIService {
       }
 
       logger.info('OpenAI response generated successfully', {
-        model: config.model,
+        model,
         tokens: completion.usage?.total_tokens,
       });
 
@@ -86,6 +123,204 @@ export class OpenAIService {
     }
   }
 
+  async generateStreamingResponse(
+    systemMessage: string,
+    userMessage: string,
+    context?: string,
+    onDelta?: (delta: string) => void,
+    signal?: AbortSignal
+  ): Promise<string> {
+    try {
+      const messages = this.buildMessages(systemMessage, userMessage, context);
+      const startTime = Date.now();
+      let firstTokenAt: number | undefined;
+      const chunks: string[] = [];
+
+      const stream = await this.client.chat.completions.create({
+        model: config.model,
+        messages,
+        temperature: config.temperature,
+        max_tokens: config.maxTokens,
+        response_format: { type: "json_object" },
+        stream: true,
+      }, { signal });
+
+      for await (const chunk of stream) {
+        const delta = chunk.choices[0]?.delta?.content;
+        if (delta) {
+          if (firstTokenAt === undefined) {
+            firstTokenAt = Date.now();
+          }
+          chunks.push(delta);
+          onDelta?.(delta);
+        }
+      }
+
+      const response = chunks.join('');
+
+      if (!response) {
+        throw new AgentError(
+          'No response received from OpenAI stream',
+          'openai',
+          'NO_RESPONSE'
+        );
+      }
+
+      logger.info('OpenAI streaming response generated successfully', {
+        model: config.model,
+        timeToFirstToken: firstTokenAt !== undefined ? firstTokenAt - startTime : undefined,
+        duration: Date.now() - startTime,
+        responseLength: response.length,
+      });
+
+      return response;
+    } catch (error) {
+      logger.error('OpenAI streaming API error', {
+        error: error instanceof Error ? error.message : 'Unknown error',
+        systemMessage: systemMessage.substring(0, 100) + '...',
+      });
+
+      if (error instanceof OpenAI.APIError) {
+        throw new AgentError(
+          `OpenAI API error: ${error.message}`,
+          'openai',
+          error.code || 'API_ERROR',
+          { status: error.status, type: error.type }
+        );
+      }
+
+      if (error instanceof AgentError) {
+        throw error;
+      }
+
+      throw new AgentError(
+        'Failed to generate streaming response from OpenAI',
+        'openai',
+        'GENERATION_FAILED',
+        { originalError: error }
+      );
+    }
+  }
+
+  /**
+   * Submit completion requests to the OpenAI Batch API (~50% cheaper,
+   * results within 24h). Returns the batch id for later polling.
+   */
+  async submitBatch(
+    requests: { customId: string; systemMessage: string; userMessage: string; context?: string }[]
+  ): Promise<string> {
+    try {
+      const jsonl = requests
+        .map(request =>
+          JSON.stringify({
+            custom_id: request.customId,
+            method: 'POST',
+            url: '/v1/chat/completions',
+            body: {
+              model: config.model,
+              messages: this.buildMessages(request.systemMessage, request.userMessage, request.context),
+              temperature: config.temperature,
+              max_tokens: config.maxTokens,
+              response_format: { type: 'json_object' },
+            },
+          })
+        )
+        .join('\n');
+
+      const inputFile = await this.client.files.create({
+        file: await toFile(Buffer.from(jsonl), 'mental-health-plan-batch.jsonl'),
+        purpose: 'batch',
+      });
+
+      const batch = await this.client.batches.create({
+        input_file_id: inputFile.id,
+        endpoint: '/v1/chat/completions',
+        completion_window: '24h',
+      });
+
+      logger.info('OpenAI batch submitted successfully', {
+        batchId: batch.id,
+        requestCount: requests.length,
+      });
+
+      return batch.id;
+    } catch (error) {
+      logger.error('OpenAI batch submission error', {
+        error: error instanceof Error ? error.message : 'Unknown error',
+      });
+
+      if (error instanceof OpenAI.APIError) {
+        throw new AgentError(
+          `OpenAI API error: ${error.message}`,
+          'openai',
+          error.code || 'API_ERROR',
+          { status: error.status, type: error.type }
+        );
+      }
+
+      throw new AgentError(
+        'Failed to submit batch to OpenAI',
+        'openai',
+        'BATCH_SUBMISSION_FAILED',
+        { originalError: error }
+      );
+    }
+  }
+
+  /**
+   * Poll a submitted batch. When completed, responses are returned as a map
+   * of custom_id to message content.
+   */
+  async getBatchResults(batchId: string): Promise<{
+    status: string;
+    results?: Record<string, string>;
+  }> {
+    try {
+      const batch = await this.client.batches.retrieve(batchId);
+
+      if (batch.status !== 'completed' || !batch.output_file_id) {
+        return { status: batch.status };
+      }
+
+      const outputFile = await this.client.files.content(batch.output_file_id);
+      const results: Record<string, string> = {};
+
+      for (const line of (await outputFile.text()).split('\n')) {
+        if (!line.trim()) {
+          continue;
+        }
+        const entry = JSON.parse(line);
+        const content = entry.response?.body?.choices?.[0]?.message?.content;
+        if (entry.custom_id && content) {
+          results[entry.custom_id] = content;
+        }
+      }
+
+      return { status: batch.status, results };
+    } catch (error) {
+      logger.error('OpenAI batch retrieval error', {
+        batchId,
+        error: error instanceof Error ? error.message : 'Unknown error',
+      });
+
+      if (error instanceof OpenAI.APIError) {
+        throw new AgentError(
+          `OpenAI API error: ${error.message}`,
+          'openai',
+          error.code || 'API_ERROR',
+          { status: error.status, type: error.type }
+        );
+      }
+
+      throw new AgentError(
+        'Failed to retrieve batch from OpenAI',
+        'openai',
+        'BATCH_RETRIEVAL_FAILED',
+        { originalError: error }
+      );
+    }
+  }
+
   async parseJsonResponse(response: string): Promise<any> {
     try {
       return JSON.parse(response);
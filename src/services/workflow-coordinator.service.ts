@@ -7,7 +7,7 @@
 
 import { UserInput, AgentContext } from '../types/index';
 import { agentCoordinator } from './agent-coordinator.service';
-import { MentalHealthWorkflow } from '../workflows/mental-health-langgraph.workflow';
+import type { MentalHealthWorkflow } from '../workflows/mental-health-langgraph.workflow';
 import { featureFlagService } from './feature-flag.service';
 import { createLogger } from '../utils/logger';
 
@@ -41,10 +41,20 @@ export interface WorkflowSelectionCriteria {
  * with intelligent routing and fallback mechanisms.
  */
 export class WorkflowCoordinatorService {
-  private traditionalCoordinator: any; // Simplified for now
+  private langGraphWorkflow?: MentalHealthWorkflow;
 
-  constructor() {
-    this.traditionalCoordinator = {}; // Simplified for now
+  /**
+   * Lazily build and reuse the LangGraph workflow - constructing it per
+   * request re-instantiated all three workflow agents every time. The module
+   * itself is loaded on first use so its LangChain/RAG dependency chain stays
+   * off the startup path when the feature flag keeps it disabled.
+   */
+  private async getLangGraphWorkflow(): Promise<MentalHealthWorkflow> {
+    if (!this.langGraphWorkflow) {
+      const { MentalHealthWorkflow } = await import('../workflows/mental-health-langgraph.workflow');
+      this.langGraphWorkflow = new MentalHealthWorkflow();
+    }
+    return this.langGraphWorkflow;
   }
 
   /**
@@ -193,7 +203,7 @@ export class WorkflowCoordinatorService {
     logger.info('Executing LangGraph workflow');
 
     try {
-      const workflow = new MentalHealthWorkflow();
+      const workflow = await this.getLangGraphWorkflow();
       const result = await workflow.execute(userInput, context);
       
       logger.info('LangGraph workflow completed successfully', {
@@ -221,16 +231,23 @@ export class WorkflowCoordinatorService {
   ): Promise<any> {
     logger.info('Executing traditional workflow');
 
-    const result = await this.traditionalCoordinator.coordinateSession(userInput, context);
-    
+    // Fixed agent order (assessment -> action -> follow-up), no extra
+    // orchestration layer in between
+    const sessionId = context?.sessionId || 'traditional-session';
+    const plan = await agentCoordinator.generateMentalHealthPlan(userInput, sessionId);
+
+    const result = {
+      assessment: plan.assessment,
+      action: plan.actionPlan,
+      followUp: plan.followUp,
+    };
+
     return {
-      sessionId: context?.sessionId || 'traditional-session',
-      assessment: result.assessment,
-      action: result.action,
-      followUp: result.followUp,
+      sessionId,
+      ...result,
       metadata: {
         workflowType: 'traditional',
-        ragEnabled: this.checkRAGUsage(result),
+        ragEnabled: plan.metadata?.ragEnabled ?? this.checkRAGUsage(result),
         qualityScore: this.calculateTraditionalQualityScore(result),
       },
     };
@@ -26,6 +26,8 @@ export interface AgentContext {
   sessionId: string;
   userId?: string;
   metadata?: Record<string, any>;
+  // Cancels in-flight LLM calls when the result is no longer needed
+  signal?: AbortSignal;
   ragContext?: {
     domain: string;
     relevantDocuments: any[];
@@ -115,6 +117,8 @@ export interface SystemConfig {
   temperature: number;
   maxTokens: number;
   timeout: number;
+  maxConnections: number;
+  streamingEnabled: boolean;
 }
 
 // Error types
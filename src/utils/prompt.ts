@@ -0,0 +1,25 @@
+import { UserInput } from '../types/index';
+
+// Control characters are stripped from user text before it is embedded in a
+// prompt: they add tokens without meaning and can break JSONL batch lines
+const CONTROL_CHARS_RE = /[\u0000-\u0008\u000B-\u001F\u007F]/g;
+
+export function sanitizePromptText(text: string): string {
+  return text.replace(CONTROL_CHARS_RE, ' ').trim();
+}
+
+// Static scaffold of the questionnaire prompt, defined once at module load.
+// Every caller (agents, single-call mode, batch submission) interpolates the
+// same fields into the same template.
+export function formatUserInputMessage(input: UserInput): string {
+  return [
+    'Please analyze the following user information and provide a response:',
+    '',
+    `Mental State: ${sanitizePromptText(input.mentalState)}`,
+    `Sleep Pattern: ${input.sleepPattern} hours per night`,
+    `Stress Level: ${input.stressLevel}/10`,
+    `Support System: ${input.supportSystem.map(sanitizePromptText).join(', ') || 'None reported'}`,
+    `Recent Changes: ${input.recentChanges ? sanitizePromptText(input.recentChanges) : 'None reported'}`,
+    `Current Symptoms: ${input.currentSymptoms.map(sanitizePromptText).join(', ') || 'None reported'}`,
+  ].join('\n');
+}
@@ -17,6 +17,10 @@ console.log('📡 Conectando con API en:', API_BASE_URL);
 // Estados de conversación para cada usuario
 const userStates = new Map();
 
+// Chats con un plan en curso: los mensajes repetidos mientras se genera
+// no deben lanzar pipelines de agentes duplicados
+const generatingChats = new Set();
+
 // Función para enviar mensaje de bienvenida
 function sendWelcomeMessage(chatId) {
   const welcomeMessage = `
@@ -122,53 +126,86 @@ async function generateMentalHealthPlan(data) {
 // Función para formatear la respuesta del plan
 function formatPlanResponse(planData) {
   const plan = planData.data;
-  
-  let message = `🧠 *Tu Plan de Salud Mental*\n\n`;
-  
+
+  // Acumular las secciones en un array y unirlas una sola vez al final,
+  // en lugar de reconstruir el string con += en cada paso
+  const parts = [`🧠 *Tu Plan de Salud Mental*\n\n`];
+
   // Assessment
-  message += `📊 *Evaluación:*\n`;
-  message += `${plan.assessment.content}\n\n`;
-  message += `*Nivel de Riesgo:* ${plan.assessment.riskLevel}\n`;
-  message += `*Emociones Principales:* ${plan.assessment.emotionalAnalysis.primaryEmotions.join(', ')}\n\n`;
-  
+  parts.push(`📊 *Evaluación:*\n`);
+  parts.push(`${plan.assessment.content}\n\n`);
+  parts.push(`*Nivel de Riesgo:* ${plan.assessment.riskLevel}\n`);
+  parts.push(`*Emociones Principales:* ${plan.assessment.emotionalAnalysis.primaryEmotions.join(', ')}\n\n`);
+
   // Action Plan
-  message += `⚡ *Plan de Acción Inmediata:*\n`;
-  message += `${plan.actionPlan.content}\n\n`;
-  message += `*Urgencia:* ${plan.actionPlan.urgency}\n\n`;
-  
+  parts.push(`⚡ *Plan de Acción Inmediata:*\n`);
+  parts.push(`${plan.actionPlan.content}\n\n`);
+  parts.push(`*Urgencia:* ${plan.actionPlan.urgency}\n\n`);
+
   // Immediate Actions
   if (plan.actionPlan.immediateActions.length > 0) {
-    message += `*Acciones Inmediatas:*\n`;
+    parts.push(`*Acciones Inmediatas:*\n`);
     plan.actionPlan.immediateActions.forEach((action, index) => {
-      message += `${index + 1}. *${action.title}* (${action.priority})\n`;
-      message += `   ${action.description}\n\n`;
+      parts.push(`${index + 1}. *${action.title}* (${action.priority})\n`);
+      parts.push(`   ${action.description}\n\n`);
     });
   }
-  
+
   // Follow Up
-  message += `🔄 *Estrategias a Largo Plazo:*\n`;
-  message += `${plan.followUp.content}\n\n`;
-  
+  parts.push(`🔄 *Estrategias a Largo Plazo:*\n`);
+  parts.push(`${plan.followUp.content}\n\n`);
+
   if (plan.followUp.longTermStrategies.length > 0) {
-    plan.followUp.longTermStrategies.forEach((strategy, index) => {
-      message += `*${strategy.category}* (${strategy.timeline}):\n`;
-      strategy.strategies.forEach(s => message += `• ${s}\n`);
-      message += `\n`;
+    plan.followUp.longTermStrategies.forEach((strategy) => {
+      parts.push(`*${strategy.category}* (${strategy.timeline}):\n`);
+      strategy.strategies.forEach(s => parts.push(`• ${s}\n`));
+      parts.push(`\n`);
     });
   }
-  
+
   // Summary
-  message += `📋 *Resumen:*\n`;
-  message += `*Insights Clave:*\n`;
+  parts.push(`📋 *Resumen:*\n`);
+  parts.push(`*Insights Clave:*\n`);
   plan.summary.keyInsights.forEach(insight => {
-    message += `• ${insight}\n`;
+    parts.push(`• ${insight}\n`);
   });
-  message += `\n*Próximos Pasos:*\n`;
+  parts.push(`\n*Próximos Pasos:*\n`);
   plan.summary.immediateNextSteps.forEach(step => {
-    message += `• ${step}\n`;
+    parts.push(`• ${step}\n`);
   });
-  
-  return message;
+
+  return parts.join('');
+}
+
+// Función para enviar el plan formateado, dividiéndolo si supera el límite
+// de Telegram (4096 caracteres)
+async function sendFormattedPlan(chatId, formattedResponse) {
+  const maxLength = 4000;
+
+  if (formattedResponse.length <= maxLength) {
+    await bot.sendMessage(chatId, formattedResponse, { parse_mode: 'Markdown' });
+    return;
+  }
+
+  const parts = [];
+  let currentPart = '';
+
+  formattedResponse.split('\n').forEach(line => {
+    if ((currentPart + line + '\n').length > maxLength) {
+      parts.push(currentPart);
+      currentPart = line + '\n';
+    } else {
+      currentPart += line + '\n';
+    }
+  });
+  parts.push(currentPart);
+
+  for (let i = 0; i < parts.length; i++) {
+    await bot.sendMessage(chatId, parts[i], { parse_mode: 'Markdown' });
+    if (i < parts.length - 1) {
+      await new Promise(resolve => setTimeout(resolve, 1000)); // Pausa entre mensajes
+    }
+  }
 }
 
 // Manejador de comandos
@@ -177,6 +214,18 @@ bot.onText(/\/start/, (msg) => {
   sendWelcomeMessage(chatId);
 });
 
+// Reenviar el último plan generado sin volver a llamar a los agentes
+bot.onText(/\/plan/, async (msg) => {
+  const chatId = msg.chat.id;
+  const state = userStates.get(chatId);
+
+  if (state?.lastPlan) {
+    await sendFormattedPlan(chatId, state.lastPlan);
+  } else {
+    bot.sendMessage(chatId, 'ℹ️ Aún no has generado ningún plan. Envía tu información para crear uno.', { parse_mode: 'Markdown' });
+  }
+});
+
 bot.onText(/\/help/, (msg) => {
   const chatId = msg.chat.id;
   sendWelcomeMessage(chatId);
@@ -189,68 +238,52 @@ bot.on('message', async (msg) => {
   
   // Ignorar comandos
   if (text.startsWith('/')) return;
-  
+
+  // Ignorar reenvíos mientras ya se está generando un plan para este chat
+  if (generatingChats.has(chatId)) {
+    bot.sendMessage(chatId, '⏳ *Tu plan ya se está generando.* Por favor, espera unos segundos.', { parse_mode: 'Markdown' });
+    return;
+  }
+
   try {
-    // Mostrar indicador de "escribiendo"
-    bot.sendChatAction(chatId, 'typing');
-    
+    generatingChats.add(chatId);
+
     // Parsear la información del usuario
     const userData = parseUserInput(text);
-    
-    // Validar datos
+
+    // Validar datos antes de cualquier otra cosa: una entrada inválida no
+    // necesita indicador de "escribiendo" ni mensaje de procesamiento
     const errors = validateData(userData);
     if (errors.length > 0) {
       const errorMessage = `❌ *Errores en los datos:*\n${errors.map(e => `• ${e}`).join('\n')}\n\nPor favor, corrige los errores y envía la información nuevamente.`;
       bot.sendMessage(chatId, errorMessage, { parse_mode: 'Markdown' });
       return;
     }
-    
+
+    // Mostrar indicador de "escribiendo"
+    bot.sendChatAction(chatId, 'typing');
+
     // Enviar mensaje de procesamiento
     const processingMsg = await bot.sendMessage(chatId, '🔄 *Generando tu plan de salud mental...*\n\nEsto puede tomar unos segundos.', { parse_mode: 'Markdown' });
     
     // Generar el plan
     const planData = await generateMentalHealthPlan(userData);
     
-    // Formatear y enviar la respuesta
+    // Formatear la respuesta y guardarla para reenviarla con /plan sin
+    // regenerar el plan
     const formattedResponse = formatPlanResponse(planData);
-    
-    // Dividir mensaje si es muy largo (límite de Telegram: 4096 caracteres)
-    const maxLength = 4000;
-    if (formattedResponse.length > maxLength) {
-      const parts = [];
-      let currentPart = '';
-      
-      formattedResponse.split('\n').forEach(line => {
-        if ((currentPart + line + '\n').length > maxLength) {
-          parts.push(currentPart);
-          currentPart = line + '\n';
-        } else {
-          currentPart += line + '\n';
-        }
-      });
-      parts.push(currentPart);
-      
-      // Eliminar mensaje de procesamiento
-      bot.deleteMessage(chatId, processingMsg.message_id);
-      
-      // Enviar partes
-      for (let i = 0; i < parts.length; i++) {
-        await bot.sendMessage(chatId, parts[i], { parse_mode: 'Markdown' });
-        if (i < parts.length - 1) {
-          await new Promise(resolve => setTimeout(resolve, 1000)); // Pausa entre mensajes
-        }
-      }
-    } else {
-      // Eliminar mensaje de procesamiento y enviar respuesta
-      bot.deleteMessage(chatId, processingMsg.message_id);
-      bot.sendMessage(chatId, formattedResponse, { parse_mode: 'Markdown' });
-    }
+    userStates.set(chatId, { lastPlan: formattedResponse, generatedAt: Date.now() });
+
+    // Eliminar mensaje de procesamiento y enviar respuesta
+    bot.deleteMessage(chatId, processingMsg.message_id);
+    await sendFormattedPlan(chatId, formattedResponse);
     
     // Enviar mensaje de seguimiento
     const followUpMessage = `
 💡 *¿Necesitas más ayuda?*
 
 • Envía /start para generar un nuevo plan
+• Envía /plan para volver a ver tu último plan
 • Envía /help para ver las instrucciones
 • Los recursos recomendados están disponibles en los enlaces proporcionados
 
@@ -277,6 +310,8 @@ bot.on('message', async (msg) => {
     }
     
     bot.sendMessage(chatId, errorMessage, { parse_mode: 'Markdown' });
+  } finally {
+    generatingChats.delete(chatId);
   }
 });
 
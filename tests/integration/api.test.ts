@@ -1,6 +1,6 @@
 import request from 'supertest';
 import app from '../../src/index';
-import { UserInput } from '../../src/types';
+import { AgentError, UserInput } from '../../src/types';
 
 // Mock the agent coordinator
 jest.mock('../../src/services/agent-coordinator.service', () => {
@@ -99,6 +99,8 @@ jest.mock('../../src/services/agent-coordinator.service', () => {
         return Promise.resolve({ ...mockPlan, sessionId });
       }),
       validatePlan: jest.fn(() => true),
+      submitPlanBatch: jest.fn(() => Promise.resolve('batch-abc123')),
+      getPlanBatchResults: jest.fn(() => Promise.resolve({ status: 'in_progress' })),
       getAgentStatus: jest.fn(() => ({
         assessment: 'Assessment Agent',
         action: 'Action Agent',
@@ -306,6 +308,121 @@ describe('API Integration Tests', () => {
     });
   });
 
+  describe('POST /api/mental-health-plan/batch', () => {
+    it('should submit a plan batch and return the batch id', async () => {
+      const { agentCoordinator } = require('../../src/services/agent-coordinator.service');
+      agentCoordinator.submitPlanBatch.mockResolvedValue('batch-abc123');
+
+      const response = await request(app)
+        .post('/api/mental-health-plan/batch')
+        .send(mockUserInput)
+        .expect(200);
+
+      expect(response.body.success).toBe(true);
+      expect(response.body.data.batchId).toBe('batch-abc123');
+      expect(response.body.data.sessionId).toEqual(expect.any(String));
+      expect(agentCoordinator.submitPlanBatch).toHaveBeenCalledWith(
+        mockUserInput,
+        expect.any(String)
+      );
+    });
+
+    it('should validate request body', async () => {
+      const invalidInput = {
+        mentalState: '',
+        sleepPattern: 15,
+        stressLevel: 12,
+        supportSystem: 'not-an-array',
+        currentSymptoms: 'not-an-array'
+      };
+
+      const response = await request(app)
+        .post('/api/mental-health-plan/batch')
+        .send(invalidInput)
+        .expect(400);
+
+      expect(response.body.success).toBe(false);
+      expect(response.body.error.code).toBe('VALIDATION_ERROR');
+    });
+
+    it('should handle missing request body', async () => {
+      const response = await request(app)
+        .post('/api/mental-health-plan/batch')
+        .send()
+        .expect(400);
+
+      expect(response.body.success).toBe(false);
+      expect(response.body.error.code).toBe('VALIDATION_ERROR');
+    });
+
+    it('should map agent errors to 422', async () => {
+      const { agentCoordinator } = require('../../src/services/agent-coordinator.service');
+      agentCoordinator.submitPlanBatch.mockRejectedValue(
+        new AgentError('Batch submission failed', 'openai', 'BATCH_SUBMISSION_FAILED')
+      );
+
+      const response = await request(app)
+        .post('/api/mental-health-plan/batch')
+        .send(mockUserInput)
+        .expect(422);
+
+      expect(response.body.success).toBe(false);
+      expect(response.body.error.code).toBe('BATCH_SUBMISSION_FAILED');
+    });
+  });
+
+  describe('GET /api/mental-health-plan/batch/:batchId', () => {
+    it('should report a pending batch without responses', async () => {
+      const { agentCoordinator } = require('../../src/services/agent-coordinator.service');
+      agentCoordinator.getPlanBatchResults.mockResolvedValue({ status: 'in_progress' });
+
+      const response = await request(app)
+        .get('/api/mental-health-plan/batch/batch-abc123')
+        .expect(200);
+
+      expect(response.body.success).toBe(true);
+      expect(response.body.data.status).toBe('in_progress');
+      expect(response.body.data.responses).toBeUndefined();
+      expect(agentCoordinator.getPlanBatchResults).toHaveBeenCalledWith('batch-abc123');
+    });
+
+    it('should return parsed responses once the batch completes', async () => {
+      const { agentCoordinator } = require('../../src/services/agent-coordinator.service');
+      agentCoordinator.getPlanBatchResults.mockResolvedValue({
+        status: 'completed',
+        responses: {
+          assessment: { content: 'Assessment analysis', riskLevel: 'medium' },
+          action: { content: 'Action plan', urgency: 'medium' },
+          followUp: { content: 'Follow-up strategy' },
+        },
+      });
+
+      const response = await request(app)
+        .get('/api/mental-health-plan/batch/batch-abc123')
+        .expect(200);
+
+      expect(response.body.success).toBe(true);
+      expect(response.body.data.status).toBe('completed');
+      expect(response.body.data.responses.assessment.riskLevel).toBe('medium');
+      expect(response.body.data.responses.action.content).toBe('Action plan');
+      expect(response.body.data.responses.followUp.content).toBe('Follow-up strategy');
+    });
+
+    it('should map agent errors to 422', async () => {
+      const { agentCoordinator } = require('../../src/services/agent-coordinator.service');
+      agentCoordinator.getPlanBatchResults.mockRejectedValue(
+        new AgentError('Batch retrieval failed', 'openai', 'BATCH_RETRIEVAL_FAILED')
+      );
+
+      const response = await request(app)
+        .get('/api/mental-health-plan/batch/batch-abc123')
+        .expect(422);
+
+      expect(response.body.success).toBe(false);
+      expect(response.body.error.code).toBe('BATCH_RETRIEVAL_FAILED');
+    });
+  });
+
   describe('Error handling', () => {
     it('should return 404 for unknown endpoints', async () => {
       const response = await request(app)
@@ -134,22 +134,36 @@ describe('AgentCoordinatorService', () => {
       expect(mockFollowUpAgent.process).toHaveBeenCalledTimes(1);
 
       // Check that agents are called with correct context
-      expect(mockAssessmentAgent.process).toHaveBeenCalledWith(mockUserInput, {
-        sessionId,
-        userInput: mockUserInput,
-      });
+      expect(mockAssessmentAgent.process).toHaveBeenCalledWith(
+        mockUserInput,
+        expect.objectContaining({
+          sessionId,
+          userInput: mockUserInput,
+          ragContext: expect.any(Object),
+        })
+      );
 
-      expect(mockActionAgent.process).toHaveBeenCalledWith(mockUserInput, {
-        sessionId,
-        userInput: mockUserInput,
-        previousResponses: expect.arrayContaining([expect.any(Object)]),
-      });
+      expect(mockActionAgent.process).toHaveBeenCalledWith(
+        mockUserInput,
+        expect.objectContaining({
+          sessionId,
+          userInput: mockUserInput,
+          previousResponses: [expect.any(Object)],
+          ragContext: expect.any(Object),
+        })
+      );
 
-      expect(mockFollowUpAgent.process).toHaveBeenCalledWith(mockUserInput, {
-        sessionId,
-        userInput: mockUserInput,
-        previousResponses: expect.arrayContaining([expect.any(Object), expect.any(Object)]),
-      });
+      // Action and follow-up run in parallel off the assessment, so both see
+      // only the assessment as previous context
+      expect(mockFollowUpAgent.process).toHaveBeenCalledWith(
+        mockUserInput,
+        expect.objectContaining({
+          sessionId,
+          userInput: mockUserInput,
+          previousResponses: [expect.any(Object)],
+          ragContext: expect.any(Object),
+        })
+      );
     });
 
     it('should generate a summary with key insights', async () => {
@@ -165,6 +179,58 @@ describe('AgentCoordinatorService', () => {
     });
   });
 
+  describe('plan cache', () => {
+    it('should serve identical input from cache without re-running the agents', async () => {
+      const first = await coordinator.generateMentalHealthPlan(mockUserInput, 'session-1');
+      const second = await coordinator.generateMentalHealthPlan(mockUserInput, 'session-2');
+
+      expect(mockAssessmentAgent.process).toHaveBeenCalledTimes(1);
+      expect(mockActionAgent.process).toHaveBeenCalledTimes(1);
+      expect(mockFollowUpAgent.process).toHaveBeenCalledTimes(1);
+
+      // The cached plan is re-stamped with the caller's session id
+      expect(first.sessionId).toBe('session-1');
+      expect(second.sessionId).toBe('session-2');
+      expect(second.assessment.content).toBe(first.assessment.content);
+    });
+
+    it('should re-run the agents for different input', async () => {
+      await coordinator.generateMentalHealthPlan(mockUserInput, 'session-1');
+      await coordinator.generateMentalHealthPlan(
+        { ...mockUserInput, stressLevel: 3 },
+        'session-2'
+      );
+
+      expect(mockAssessmentAgent.process).toHaveBeenCalledTimes(2);
+      expect(mockActionAgent.process).toHaveBeenCalledTimes(2);
+      expect(mockFollowUpAgent.process).toHaveBeenCalledTimes(2);
+    });
+
+    it('should expire cached plans after the TTL', async () => {
+      await coordinator.generateMentalHealthPlan(mockUserInput, 'session-1');
+
+      const now = Date.now();
+      const nowSpy = jest.spyOn(Date, 'now').mockReturnValue(now + 25 * 60 * 60 * 1000);
+      try {
+        await coordinator.generateMentalHealthPlan(mockUserInput, 'session-2');
+        expect(mockAssessmentAgent.process).toHaveBeenCalledTimes(2);
+      } finally {
+        nowSpy.mockRestore();
+      }
+    });
+
+    it('should not let callers mutate cached plans', async () => {
+      const first = await coordinator.generateMentalHealthPlan(mockUserInput, 'session-1');
+      first.summary.keyInsights.push('mutated by caller');
+      first.assessment.riskLevel = 'high';
+
+      const second = await coordinator.generateMentalHealthPlan(mockUserInput, 'session-2');
+
+      expect(second.summary.keyInsights).not.toContain('mutated by caller');
+      expect(second.assessment.riskLevel).toBe('medium');
+    });
+  });
+
   describe('validatePlan', () => {
     it('should validate a complete plan successfully', async () => {
       const sessionId = 'test-session-123';